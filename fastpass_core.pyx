@@ -0,0 +1,135 @@
+# cython: language_level=3
+"""
+Richard Stoiberer - CMS 380 - Dr. Myers
+
+FastPass+ Simulation Core (Cython)
+
+Static C version of the FastPass+ event loop, for environments without Numba.
+simulate() takes the same arguments and returns the same (2, N_STATS) stats
+array as _simulate_core in fastpass_simulator.py.
+
+Build in place with:  python setup.py build_ext --inplace
+"""
+
+cimport cython
+import numpy as np
+
+# Must match the layout constants in fastpass_simulator.py
+cdef enum:
+    FP_INT = 0
+    REG_INT = 1
+
+cdef enum:
+    N_STATS = 4
+    STAT_TOTAL = 0
+    STAT_COMPLETED = 1
+    STAT_RESIDENCE_SUM = 2
+    STAT_RESIDENCE_MAX = 3
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def simulate(const double[:] interarrivals, const double[:] services, is_fp,
+             long n_fp0, long n_reg0, double sim_time, double warm_up):
+    """
+    Simulate the FastPass+ system on pre-drawn random streams
+
+    Args:
+        interarrivals, services: Random streams from draw_streams
+        is_fp: Boolean array, True for arriving customers holding a FastPass
+        n_fp0, n_reg0: Number of customers present at time 0 per type
+        sim_time: Total simulation time (minutes)
+        warm_up: Warm-up period before collecting statistics (minutes)
+
+    Returns:
+        Array of shape (2, N_STATS) indexed by [FP_INT or REG_INT, STAT_*]
+    """
+    cdef const unsigned char[:] is_fp_view = np.ascontiguousarray(is_fp, dtype=np.uint8)
+    cdef long n_pre = n_fp0 + n_reg0
+    cdef long n_max = n_pre + interarrivals.shape[0]
+    if services.shape[0] < n_max:
+        raise ValueError("services must hold an entry for every initial and arriving customer")
+
+    stats_arr = np.zeros((2, N_STATS), dtype=np.float64)
+    cdef double[:, :] stats = stats_arr
+
+    # Customers as struct-of-arrays; ids below n_pre are the initial
+    # customers, arriving customer cid uses stream entry cid - n_pre
+    cust_arrival_arr = np.zeros(n_max, dtype=np.float64)
+    cust_type_arr = np.empty(n_max, dtype=np.int8)
+    cust_type_arr[:n_fp0] = FP_INT
+    cust_type_arr[n_fp0:n_pre] = REG_INT
+    cdef double[:] cust_arrival = cust_arrival_arr
+    cdef signed char[:] cust_type = cust_type_arr
+
+    # Waiting lines with head and tail cursors; a customer joins a queue at
+    # most once, so the buffers never need to wrap around
+    fp_buf_arr = np.empty(n_max, dtype=np.int64)
+    reg_buf_arr = np.empty(n_max, dtype=np.int64)
+    fp_buf_arr[:n_fp0] = np.arange(n_fp0)
+    reg_buf_arr[:n_reg0] = np.arange(n_fp0, n_pre)
+    cdef long long[:] fp_buf = fp_buf_arr
+    cdef long long[:] reg_buf = reg_buf_arr
+    cdef long fp_head = 0
+    cdef long fp_tail = n_fp0
+    cdef long reg_head = 0
+    cdef long reg_tail = n_reg0
+
+    cdef long next_cid = n_pre
+    cdef long i_svc = 0
+    cdef long cid
+    cdef int ctype
+    cdef bint server_busy = False
+    cdef double server_end_time = 0.0
+    cdef long departing_cid = -1
+    cdef double current_time = 0.0
+    cdef double next_arrival_time = interarrivals[0]
+    cdef double residence_time
+
+    while current_time < sim_time:
+        # Start the next service, FastPass holders first
+        if not server_busy and (fp_head != fp_tail or reg_head != reg_tail):
+            if fp_head != fp_tail:
+                cid = fp_buf[fp_head]
+                fp_head += 1
+            else:
+                cid = reg_buf[reg_head]
+                reg_head += 1
+            server_busy = True
+            server_end_time = current_time + services[i_svc]
+            i_svc += 1
+            departing_cid = cid
+
+        if not server_busy or next_arrival_time < server_end_time:
+            # Arrival
+            current_time = next_arrival_time
+            cid = next_cid
+            next_cid += 1
+            cust_arrival[cid] = current_time
+
+            if is_fp_view[cid - n_pre]:
+                cust_type[cid] = FP_INT
+                fp_buf[fp_tail] = cid
+                fp_tail += 1
+                stats[FP_INT, STAT_TOTAL] += 1
+            else:
+                cust_type[cid] = REG_INT
+                reg_buf[reg_tail] = cid
+                reg_tail += 1
+                stats[REG_INT, STAT_TOTAL] += 1
+
+            next_arrival_time = current_time + interarrivals[next_cid - n_pre]
+        else:
+            # Departure
+            current_time = server_end_time
+            cid = departing_cid
+            server_busy = False
+            if current_time > warm_up and cid >= n_pre:
+                ctype = cust_type[cid]
+                residence_time = current_time - cust_arrival[cid]
+                stats[ctype, STAT_COMPLETED] += 1
+                stats[ctype, STAT_RESIDENCE_SUM] += residence_time
+                if residence_time > stats[ctype, STAT_RESIDENCE_MAX]:
+                    stats[ctype, STAT_RESIDENCE_MAX] = residence_time
+
+    return stats_arr
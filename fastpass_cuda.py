@@ -0,0 +1,195 @@
+"""
+Richard Stoiberer - CMS 380 - Dr. Myers
+
+FastPass+ GPU Experiment Sweep
+
+Runs the FastPass+ simulation sweep on a CUDA GPU with Numba, one thread per
+(arrival rate, FastPass fraction, replication) cell. Every thread simulates an
+independent trajectory of the same model as fastpass_simulator.py with its own
+xoroshiro128+ random stream, and the replications are pooled on the CPU.
+"""
+
+import math
+
+import numpy as np
+from numba import cuda, float64
+from numba.cuda.random import create_xoroshiro128p_states, xoroshiro128p_uniform_float64
+
+from fastpass_simulator import (
+    SIMULATION_TIME, WARM_UP_TIME, SERVICE_RATE, FASTPASS, REGULAR, FP_INT, REG_INT,
+    N_STATS, STAT_TOTAL, STAT_COMPLETED, STAT_RESIDENCE_SUM, STAT_RESIDENCE_MAX,
+    _stats_from_array
+)
+
+# Capacity of each per-thread waiting line (power of two). Replications that
+# overflow it are dropped before pooling, and a cell with none left is reported
+# as NaN; 1024 is far above the queue lengths seen at ρ ≤ 0.95
+QUEUE_CAPACITY = 1024
+THREADS_PER_BLOCK = 128
+
+
+@cuda.jit(device=True)
+def _exponential(rng_states, tid, rate):
+    """Draw an exponential variate from the thread's random stream"""
+    return -math.log(1.0 - xoroshiro128p_uniform_float64(rng_states, tid)) / rate
+
+
+@cuda.jit(device=True)
+def sim_one(lam, frac, sim_time, warm_up, rng_states, out_stats, tid):
+    """
+    Simulate one trajectory and write its (2, N_STATS) stats into out_stats[tid]
+
+    The waiting lines are ring buffers of arrival times in thread-local
+    memory; the queue a customer waits in determines its type
+    """
+    fp_buf = cuda.local.array(QUEUE_CAPACITY, float64)
+    reg_buf = cuda.local.array(QUEUE_CAPACITY, float64)
+    mask = QUEUE_CAPACITY - 1
+    fp_head = 0
+    fp_count = 0
+    reg_head = 0
+    reg_count = 0
+
+    stats = out_stats[tid]
+    for row in range(2):
+        for col in range(N_STATS):
+            stats[row, col] = 0.0
+
+    server_busy = False
+    server_end_time = 0.0
+    serving_arrival = 0.0
+    serving_type = FP_INT
+    overflow = False
+    current_time = 0.0
+    next_arrival_time = _exponential(rng_states, tid, lam)
+
+    while current_time < sim_time:
+        if not server_busy or next_arrival_time < server_end_time:
+            # Arrival
+            current_time = next_arrival_time
+            if xoroshiro128p_uniform_float64(rng_states, tid) < frac:
+                if fp_count == QUEUE_CAPACITY:
+                    overflow = True
+                    break
+                fp_buf[(fp_head + fp_count) & mask] = current_time
+                fp_count += 1
+                stats[FP_INT, STAT_TOTAL] += 1
+            else:
+                if reg_count == QUEUE_CAPACITY:
+                    overflow = True
+                    break
+                reg_buf[(reg_head + reg_count) & mask] = current_time
+                reg_count += 1
+                stats[REG_INT, STAT_TOTAL] += 1
+            next_arrival_time = current_time + _exponential(rng_states, tid, lam)
+        else:
+            # Departure
+            current_time = server_end_time
+            server_busy = False
+            if current_time > warm_up:
+                residence_time = current_time - serving_arrival
+                stats[serving_type, STAT_COMPLETED] += 1
+                stats[serving_type, STAT_RESIDENCE_SUM] += residence_time
+                if residence_time > stats[serving_type, STAT_RESIDENCE_MAX]:
+                    stats[serving_type, STAT_RESIDENCE_MAX] = residence_time
+
+        # Start the next service, FastPass holders first
+        if not server_busy and fp_count + reg_count > 0:
+            if fp_count > 0:
+                serving_arrival = fp_buf[fp_head]
+                serving_type = FP_INT
+                fp_head = (fp_head + 1) & mask
+                fp_count -= 1
+            else:
+                serving_arrival = reg_buf[reg_head]
+                serving_type = REG_INT
+                reg_head = (reg_head + 1) & mask
+                reg_count -= 1
+            server_busy = True
+            server_end_time = current_time + _exponential(rng_states, tid, SERVICE_RATE)
+
+    if overflow:
+        for row in range(2):
+            for col in range(N_STATS):
+                stats[row, col] = math.nan
+
+
+@cuda.jit
+def _sweep_kernel(lam_arr, frac_arr, sim_time, warm_up, rng_states, out_stats):
+    """One simulated trajectory per thread"""
+    tid = cuda.grid(1)
+    if tid < lam_arr.shape[0]:
+        sim_one(lam_arr[tid], frac_arr[tid], sim_time, warm_up, rng_states, out_stats, tid)
+
+
+def run_experiments_cuda(arrival_rates, fastpass_fractions, n_reps=100, seed=42,
+                         sim_time=SIMULATION_TIME, warm_up=WARM_UP_TIME):
+    """
+    GPU version of fastpass_simulator.run_experiments with replications
+
+    Args:
+        arrival_rates: List of arrival rates to test
+        fastpass_fractions: List of FastPass fractions to test
+        n_reps: Number of independent replications per (λ, f) cell
+        seed: Seed for the per-thread xoroshiro128+ streams
+        sim_time: Simulated time per replication (minutes)
+        warm_up: Warm-up period per replication (minutes)
+
+    Returns:
+        Dictionary with results for each experiment, with residence times
+        pooled over the replications that did not overflow QUEUE_CAPACITY
+    """
+    n_rates = len(arrival_rates)
+    n_fractions = len(fastpass_fractions)
+
+    # One thread per (λ, f, replication) cell, in C order
+    lam_grid, frac_grid, _ = np.meshgrid(np.asarray(arrival_rates, dtype=np.float64),
+                                         np.asarray(fastpass_fractions, dtype=np.float64),
+                                         np.arange(n_reps), indexing='ij')
+    lam_arr = lam_grid.ravel()
+    frac_arr = frac_grid.ravel()
+    n_threads = len(lam_arr)
+
+    rng_states = create_xoroshiro128p_states(n_threads, seed=seed)
+    d_out_stats = cuda.device_array((n_threads, 2, N_STATS), dtype=np.float64)
+    blocks = (n_threads + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+    _sweep_kernel[blocks, THREADS_PER_BLOCK](cuda.to_device(lam_arr), cuda.to_device(frac_arr),
+                                              sim_time, warm_up, rng_states, d_out_stats)
+    out_stats = d_out_stats.copy_to_host().reshape(n_rates, n_fractions, n_reps, 2, N_STATS)
+
+    # Overflowed replications come back as NaN; zero them so they drop out of
+    # the pooled sums, leaving a cell without valid replications at 0 completions
+    overflowed = np.isnan(out_stats).any(axis=(-2, -1))
+    if overflowed.any():
+        print(f"Warning: dropped {overflowed.sum()} replication(s) that overflowed "
+              f"QUEUE_CAPACITY={QUEUE_CAPACITY}")
+    out_stats[overflowed] = 0.0
+
+    # Pool the replications of every cell
+    pooled = out_stats.sum(axis=2)
+    pooled[..., STAT_RESIDENCE_MAX] = out_stats[..., STAT_RESIDENCE_MAX].max(axis=2)
+
+    results = {}
+    for i, arrival_rate in enumerate(arrival_rates):
+        run_stats = [_stats_from_array(core_stats) for core_stats in pooled[i]]
+        results[arrival_rate] = {
+            'fastpass_times': [stats[FASTPASS]['avg_residence_time'] for stats in run_stats],
+            'regular_times': [stats[REGULAR]['avg_residence_time'] for stats in run_stats],
+            'fractions': fastpass_fractions
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    arrival_rates = [0.5, 0.95]
+    fastpass_fractions = np.linspace(0, 0.95, 20)
+    results = run_experiments_cuda(arrival_rates, fastpass_fractions)
+
+    for arrival_rate in arrival_rates:
+        print(f"\nResults for λ={arrival_rate}:")
+        result = results[arrival_rate]
+        for fraction, fastpass_time, regular_time in zip(
+                result['fractions'], result['fastpass_times'], result['regular_times']):
+            print(f"  f={fraction:.2f}: FastPass {fastpass_time:.2f} min, "
+                  f"Regular {regular_time:.2f} min")
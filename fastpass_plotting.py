@@ -0,0 +1,45 @@
+"""
+Richard Stoiberer - CMS 380 - Dr. Myers
+
+FastPass+ Plotting Helpers
+
+Shared matplotlib setup for fastpass_simulator.py and visualization_fastpass.py.
+Importing this module picks the Agg backend when there is no display to show
+figures on, so the scripts can run headless and still save their plots.
+"""
+
+import os
+import sys
+import matplotlib
+import numpy as np
+
+if (sys.platform.startswith('linux') and 'MPLBACKEND' not in os.environ
+        and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY')):
+    matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+
+def get_axes(fig, axes, n_rows, figsize):
+    """
+    Return a (fig, axes) pair with at least n_rows axes to draw into
+
+    With no fig, creates a new figure with one column of n_rows subplots.
+    With a fig but no axes, uses the figure's axes, adding the subplots if
+    it has none. Passing the fig and axes of an earlier call redraws into them.
+    """
+    if fig is None:
+        fig, axes = plt.subplots(n_rows, 1, figsize=figsize, constrained_layout=True)
+    elif axes is None:
+        axes = fig.axes if fig.axes else fig.subplots(n_rows, 1)
+
+    axes = np.atleast_1d(axes)
+    if len(axes) < n_rows:
+        raise ValueError(f"need {n_rows} axes to plot into, got {len(axes)}")
+    return fig, axes
+
+
+def finish_figure(fig, filename):
+    """Save the figure, and show it too when there is a display"""
+    fig.savefig(filename, dpi=100)
+    if matplotlib.get_backend().lower() != 'agg':
+        plt.show()
@@ -0,0 +1,23 @@
+"""
+Build script for the optional Cython simulation core
+
+    python setup.py build_ext --inplace
+"""
+
+import numpy as np
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+extensions = [
+    Extension(
+        'fastpass_core',
+        ['fastpass_core.pyx'],
+        include_dirs=[np.get_include()],
+        extra_compile_args=['-O3', '-march=native'],
+    )
+]
+
+setup(
+    name='fastpass_core',
+    ext_modules=cythonize(extensions, compiler_directives={'language_level': 3}),
+)
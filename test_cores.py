@@ -0,0 +1,69 @@
+"""
+Regression check that every simulation core runs the same event loop
+
+The pure Python loop, the Numba core and the Cython core must return
+identical statistics on the same random streams. The CUDA kernel draws its
+own streams on the device, so it is not compared here.
+
+    python -m unittest test_cores
+"""
+
+import unittest
+
+import numpy as np
+
+import fastpass_simulator as fs
+
+try:
+    from fastpass_core import simulate as simulate_cython
+except ImportError:
+    simulate_cython = None
+
+SIM_TIME = 5000
+CASES = [  # (fastpass_fraction, n_fp0, n_reg0, warm_up)
+    (0.0, 0, 0, 500.0),
+    (0.5, 0, 0, 500.0),
+    (0.9, 0, 0, 0.0),
+    (0.5, 3, 7, 0.0),
+    (0.9, 12, 40, 100.0),
+]
+
+
+def _python_stats(streams, fraction, n_fp0, n_reg0, warm_up):
+    """Run the pure Python loop and pack its dictionary like the compiled cores"""
+    stats = fs.simulate_fastpass_system_crn(*streams, fraction, n_fp0, n_reg0, warm_up, SIM_TIME)
+    core_stats = np.zeros((2, fs.N_STATS))
+    for customer_type, row in ((fs.FASTPASS, fs.FP_INT), (fs.REGULAR, fs.REG_INT)):
+        core_stats[row, fs.STAT_TOTAL] = stats[customer_type]['total_customers']
+        core_stats[row, fs.STAT_COMPLETED] = stats[customer_type]['completed_customers']
+        core_stats[row, fs.STAT_RESIDENCE_SUM] = stats[customer_type]['total_residence_time']
+        core_stats[row, fs.STAT_RESIDENCE_MAX] = stats[customer_type]['max_residence_time']
+    return core_stats
+
+
+class CoreAgreementTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(380)
+        self.streams = fs.draw_streams(rng, 0.95, SIM_TIME, n_initial=52)
+
+    def _check(self, core):
+        interarrivals, services, u_class = self.streams
+        for fraction, n_fp0, n_reg0, warm_up in CASES:
+            with self.subTest(f=fraction, n_fp0=n_fp0, n_reg0=n_reg0, warm_up=warm_up):
+                expected = _python_stats(self.streams, fraction, n_fp0, n_reg0, warm_up)
+                actual = core(interarrivals, services, u_class < fraction,
+                              n_fp0, n_reg0, SIM_TIME, warm_up)
+                np.testing.assert_array_equal(actual, expected)
+
+    @unittest.skipIf(fs.njit is None, "Numba is not installed")
+    def test_numba_core(self):
+        self._check(fs._simulate_core)
+
+    @unittest.skipIf(simulate_cython is None, "fastpass_core is not built")
+    def test_cython_core(self):
+        self._check(simulate_cython)
+
+
+if __name__ == "__main__":
+    unittest.main()
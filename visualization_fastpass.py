@@ -8,18 +8,13 @@ It plots residence times for both FastPass and regular customers as a
 function of the FastPass allocation fraction.
 """
 
-import matplotlib.pyplot as plt
+import os
 import numpy as np
 
-def plot_fastpass_results(results_file=None):
-    """
-    Plot FastPass+ simulation results
-    
-    If results_file is provided, loads results from the file.
-    Otherwise, uses pre-defined results for demonstration.
-    """
-    # Use pre-defined results if no file is provided
-    # These are results from a previous run of the simulation
+from fastpass_plotting import get_axes, finish_figure
+
+def _default_results():
+    """Pre-defined results from a previous run of the simulation"""
     fractions = np.array([0, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.35, 0.4, 0.45,
                          0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95])
     
@@ -39,49 +34,79 @@ def plot_fastpass_results(results_file=None):
                                32.452, 32.148, 29.321, 25.677, 58.659, 28.527, 
                                49.362, 46.552, 65.308, 64.304, 79.345, 83.357, 
                                211.362, 121.572])
+    
+    return 0.5, 0.95, fractions, low_fp_times, low_reg_times, high_fp_times, high_reg_times
 
+def plot_fastpass_results(results_file='fastpass_results.npz', fig=None, axes=None):
+    """
+    Plot FastPass+ simulation results
+    
+    If results_file exists, loads the results saved by run_experiments, whose
+    first two arrival rates are plotted as low and high utilization.
+    Otherwise, or if the file holds fewer than two arrival rates, uses
+    pre-defined results for demonstration.
+    fig and axes select where to draw, as in fastpass_plotting.get_axes.
+    """
+    data = None
+    if results_file is not None and os.path.exists(results_file):
+        with np.load(results_file) as npz:
+            data = {key: npz[key] for key in npz.files}
+        if len(data['arrival_rates']) < 2:
+            print(f"Warning: {results_file} holds {len(data['arrival_rates'])} arrival rate(s), "
+                  "need 2; using pre-defined results")
+            data = None
+    
+    if data is not None:
+        low_rate, high_rate = data['arrival_rates'][:2]
+        fractions = data['fractions']
+        low_fp_times, high_fp_times = data['fastpass_times'][:2]
+        low_reg_times, high_reg_times = data['regular_times'][:2]
+    else:
+        (low_rate, high_rate, fractions, low_fp_times, low_reg_times,
+         high_fp_times, high_reg_times) = _default_results()
+    
     # Create figure with two subplots
-    fig, axes = plt.subplots(2, 1, figsize=(10, 12))
+    fig, axes = get_axes(fig, axes, 2, figsize=(10, 12))
     
-    # Plot for low utilization (λ = 0.5)
+    # Plot for low utilization
     ax = axes[0]
+    ax.clear()
     ax.plot(fractions, low_fp_times, 'b-o', label='FastPass Customers')
     ax.plot(fractions, low_reg_times, 'r-o', label='Regular Customers')
     
     # Add theoretical M/M/1 time
-    theoretical_mm1_time_low = 1 / (1 - 0.5)
+    theoretical_mm1_time_low = 1 / (1 - low_rate)
     ax.axhline(y=theoretical_mm1_time_low, color='g', linestyle='--', 
               label=f'M/M/1 Time: {theoretical_mm1_time_low:.2f}')
     
     # Add labels and title
     ax.set_xlabel('FastPass Fraction (f)')
     ax.set_ylabel('Average Residence Time (minutes)')
-    ax.set_title('Residence Times vs. FastPass Fraction (λ=0.5)')
+    ax.set_title(f'Residence Times vs. FastPass Fraction (λ={low_rate})')
     ax.grid(True)
     ax.legend()
     ax.set_ylim(0, 5)  # Set y-axis limits for better visualization
     
-    # Plot for high utilization (λ = 0.95)
+    # Plot for high utilization
     ax = axes[1]
+    ax.clear()
     ax.plot(fractions, high_fp_times, 'b-o', label='FastPass Customers')
     ax.plot(fractions, high_reg_times, 'r-o', label='Regular Customers')
     
     # Add theoretical M/M/1 time
-    theoretical_mm1_time_high = 1 / (1 - 0.95)
+    theoretical_mm1_time_high = 1 / (1 - high_rate)
     ax.axhline(y=theoretical_mm1_time_high, color='g', linestyle='--', 
                label=f'M/M/1 Time: {theoretical_mm1_time_high:.2f}')
     
     # Add labels and title
     ax.set_xlabel('FastPass Fraction (f)')
     ax.set_ylabel('Average Residence Time (minutes)')
-    ax.set_title('Residence Times vs. FastPass Fraction (λ=0.95)')
+    ax.set_title(f'Residence Times vs. FastPass Fraction (λ={high_rate})')
     ax.grid(True)
     ax.legend()
     ax.set_ylim(0, 100)  # Set y-axis limits
     
-    plt.tight_layout()
-    plt.savefig('fastpass_results.png')
-    plt.show()
+    finish_figure(fig, 'fastpass_results.png')
     
     # Return the figure for further modification if needed
     return fig